@@ -4,48 +4,196 @@ S3 Storage Client Example
 Demonstrates authentication, presigned URLs, and API usage
 """
 
+import asyncio
 import hmac
 import hashlib
 import base64
+import io
+import os
+import sys
+import time
+import functools
+import warnings
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
-from datetime import datetime, timezone
-from urllib.parse import urljoin, urlencode
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from email.utils import formatdate
+from urllib.parse import quote
 
-class S3Client:
-    """Simple S3-compatible storage client with HMAC authentication"""
+try:
+    import httpx  # optional, only needed for AsyncS3Client
+except ImportError:
+    httpx = None
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Read size used when streaming file-like upload bodies
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Byte payloads smaller than this are hashed in one shot instead of being
+# streamed when trailing_md5 is requested
+TRAILING_MD5_MIN_SIZE = 64 * 1024
+
+# ETags that are a plain hex MD5 and can be checked by trailing_md5
+_MD5_ETAG_RE = re.compile(r'[0-9a-f]{32}')
+
+
+# hashlib/hmac delegate SHA-256 to OpenSSL, which uses the SHA-NI
+# instructions on CPUs that have them. Warn when hashlib falls back to its
+# builtin implementation or OpenSSL looks older than 1.1.1. hashlib does
+# not report its OpenSSL version, so the ssl module's (normally the same
+# library) stands in for it.
+_HASHLIB_OPENSSL = hashlib.sha256.__name__ == 'openssl_sha256'
+try:
+    import ssl
+    _OPENSSL_VERSION_INFO = ssl.OPENSSL_VERSION_INFO
+except ImportError:
+    _OPENSSL_VERSION_INFO = ()
+
+if not _HASHLIB_OPENSSL or _OPENSSL_VERSION_INFO < (1, 1, 1):
+    warnings.warn(
+        "hashlib is not backed by OpenSSL >= 1.1.1; request signing will not "
+        "use the accelerated SHA-256 implementation",
+        RuntimeWarning
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _sign_prefix(method, path):
+    """Encoded method/path prefix of the string to sign, cached per pair"""
+    return f"{method}\n{path}\n".encode('utf-8')
+
+
+@functools.lru_cache(maxsize=4096)
+def _presign_template(base_url, access_key, bucket, key, method):
+    """Encoded string-to-sign prefix and URL head of a presigned URL.
+    
+    Only the expiry and signature change between calls for the same
+    object and method, so everything else is cached here.
+    """
+    return (
+        f"{method}\n{bucket}/{key}\n".encode('utf-8'),
+        f"{base_url}/{bucket}/{key}?AWSAccessKeyId={quote(access_key, safe='')}&Expires="
+    )
+
+
+if sys.version_info >= (3, 9):
+    def _new_md5(data=b''):
+        """MD5 used as an integrity checksum, not for security"""
+        return hashlib.md5(data, usedforsecurity=False)
+else:
+    _new_md5 = hashlib.md5
+
+
+# Module-level aliases for per-request stdlib calls: one global lookup
+# instead of a global plus a module attribute lookup
+_time = time.time
+_b64encode = base64.b64encode
+
+
+def _iter_chunks(fileobj, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Yield successive chunks read from a file-like object"""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _iter_hashed_chunks(fileobj, md5, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Yield chunks from a file-like object, feeding each into md5"""
+    for chunk in _iter_chunks(fileobj, chunk_size):
+        md5.update(chunk)
+        yield chunk
+
+
+def _collect_keys(events, keys):
+    """Append the text of every Key element in ElementTree 'end' events to keys"""
+    for _, elem in events:
+        tag = elem.tag.rpartition('}')[2]
+        if tag == 'Key':
+            keys.append(elem.text)
+        elif tag == 'Contents':
+            elem.clear()
+
+
+def _object_metadata(h):
+    """Build the head_object result dict from response headers"""
+    etag = h.get('ETag', '')
+    return {
+        'size': int(h.get('Content-Length') or 0),
+        'etag': etag[1:-1] if etag.startswith('"') else etag,
+        'content_type': h.get('Content-Type', ''),
+        'last_modified': h.get('Last-Modified', '')
+    }
+
+
+class _StreamingBody:
+    """Upload body that streams a file-like object with a known length.
+    
+    Exposing __len__ lets requests send a Content-Length header instead of
+    falling back to chunked transfer encoding for an iterable body. With
+    hash_md5 set, the MD5 of the bytes sent is computed on the way out.
+    """
+    
+    def __init__(self, fileobj, length, chunk_size=UPLOAD_CHUNK_SIZE, hash_md5=False):
+        self._fileobj = fileobj
+        self._start = fileobj.tell()
+        self._length = length
+        self._chunk_size = chunk_size
+        self._hash_md5 = hash_md5
+        # Set up front: requests never iterates an empty body, which still
+        # has to report the MD5 of zero bytes
+        self.md5 = _new_md5() if hash_md5 else None
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        # Rewind so a retried request resends (and rehashes) the whole body
+        self._fileobj.seek(self._start)
+        if not self._hash_md5:
+            return _iter_chunks(self._fileobj, self._chunk_size)
+        self.md5 = _new_md5()
+        return _iter_hashed_chunks(self._fileobj, self.md5, self._chunk_size)
+
+
+class _S3Signer:
+    """HMAC request signing shared by S3Client and AsyncS3Client (no I/O)"""
+    
+    __slots__ = ('base_url', 'access_key', 'secret_key', '_hmac_template', '_auth_prefix')
     
     def __init__(self, base_url, access_key, secret_key):
-        """
-        Initialize S3 client
-        
-        Args:
-            base_url: Base URL of the S3 gateway (e.g., http://localhost:9000)
-            access_key: Your access key
-            secret_key: Your secret key
-        """
         self.base_url = base_url.rstrip('/')
         self.access_key = access_key
         self.secret_key = secret_key
+        # Keyed HMAC state (ipad/opad already absorbed), copied per signature
+        self._hmac_template = hmac.new(secret_key.encode('utf-8'), None, hashlib.sha256)
+        self._auth_prefix = f'S3-HMAC-SHA256 AccessKey={access_key},Signature='
+    
+    def _hmac_hex(self, msg):
+        """HMAC-SHA256 hex digest of msg under the secret key"""
+        h = self._hmac_template.copy()
+        h.update(msg)
+        return h.hexdigest()
     
     def _sign_request(self, method, path, date_header):
         """Generate HMAC-SHA256 signature"""
-        string_to_sign = f"{method}\n{path}\n{date_header}"
-        signature = hmac.new(
-            self.secret_key.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        string_to_sign = _sign_prefix(method, path) + date_header.encode('ascii')
+        return self._hmac_hex(string_to_sign)
     
     def _get_headers(self, method, path, content_type=None, content_md5=None):
         """Generate request headers with authentication"""
-        date_header = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')
+        date_header = formatdate(usegmt=True)
         signature = self._sign_request(method, path, date_header)
         
         headers = {
             'Date': date_header,
-            'Authorization': f'S3-HMAC-SHA256 AccessKey={self.access_key},Signature={signature}'
+            'Authorization': self._auth_prefix + signature
         }
         
         if content_type:
@@ -56,38 +204,174 @@ class S3Client:
         
         return headers
     
-    def put_object(self, bucket, key, data, content_type='application/octet-stream', verify_md5=False):
+    def generate_presigned_url(self, bucket, key, method='GET', expires_in=3600):
+        """
+        Generate a presigned URL (note: this should ideally be done server-side)
+        
+        Args:
+            bucket: Bucket name
+            key: Object key
+            method: HTTP method (GET, PUT, DELETE)
+            expires_in: Expiration time in seconds
+        
+        Returns:
+            Presigned URL string
+        """
+        sign_prefix, url_head = _presign_template(self.base_url, self.access_key, bucket, key, method)
+        expires = int(_time()) + expires_in
+        
+        signature = self._hmac_hex(sign_prefix + str(expires).encode('ascii'))
+        
+        return f"{url_head}{expires}&Signature={signature}"
+
+
+class S3Client(_S3Signer):
+    """Simple S3-compatible storage client with HMAC authentication"""
+    
+    __slots__ = ('_session',)
+    
+    def __init__(self, base_url, access_key, secret_key):
+        """
+        Initialize S3 client
+        
+        Args:
+            base_url: Base URL of the S3 gateway (e.g., http://localhost:9000)
+            access_key: Your access key
+            secret_key: Your secret key
+        """
+        super().__init__(base_url, access_key, secret_key)
+        
+        # Reuse pooled keep-alive connections instead of a fresh
+        # TCP/TLS handshake per request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                # Hand the last response back so raise_for_status() reports it
+                raise_on_status=False
+            )
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def put_object(self, bucket, key, data, content_type='application/octet-stream', verify_md5=False,
+                   trailing_md5=False):
         """
         Upload an object
         
         Args:
             bucket: Bucket name
             key: Object key
-            data: Object data (bytes or string)
+            data: Object data (bytes, string, or a binary file-like object,
+                which is streamed in chunks instead of loaded into memory;
+                non-seekable streams such as pipes are sent chunked)
             content_type: Content type
-            verify_md5: If True, calculate and send Content-MD5 header
+            verify_md5: If True, calculate and send Content-MD5 header (not
+                supported for non-seekable streams)
+            trailing_md5: If True, hash the body while it streams and check
+                the result against the ETag returned by the server instead of
+                making a separate MD5 pass before sending. Byte payloads under
+                TRAILING_MD5_MIN_SIZE are hashed in one shot and checked the
+                same way. The check runs after the upload, so on a mismatch
+                the object is already stored and is left in place. Backends
+                whose ETag is not a hex MD5 (e.g. erasure-coded deployments
+                without Content-MD5) cannot be checked and only get a warning.
+                Cannot be combined with verify_md5.
         
         Returns:
             Response object
+        
+        Raises:
+            ValueError: If both verify_md5 and trailing_md5 are set, or if
+                trailing_md5 is set and the returned ETag does not match the
+                MD5 of the uploaded bytes
         """
+        if verify_md5 and trailing_md5:
+            raise ValueError("verify_md5 and trailing_md5 are mutually exclusive")
+        
         path = f"/{bucket}/{key}"
-        url = urljoin(self.base_url, path)
+        url = self.base_url + path
         
         # Convert string to bytes if needed
         if isinstance(data, str):
             data = data.encode('utf-8')
         
-        # Calculate MD5 if requested
+        sent_md5 = None
+        if trailing_md5 and not hasattr(data, 'read'):
+            if len(data) >= TRAILING_MD5_MIN_SIZE:
+                data = io.BytesIO(data)
+            else:
+                sent_md5 = _new_md5(data).hexdigest()
+        
         content_md5 = None
-        if verify_md5:
-            md5 = hashlib.md5(data).digest()
-            content_md5 = base64.b64encode(md5).decode('utf-8')
+        stream_md5 = None
+        if hasattr(data, 'read') and not (hasattr(data, 'seekable') and data.seekable()):
+            # The length is unknown and the stream cannot be rewound, so it
+            # goes out with chunked transfer encoding
+            if verify_md5:
+                raise ValueError("verify_md5 requires bytes or a seekable file; "
+                                 "use trailing_md5 for non-seekable streams")
+            if trailing_md5:
+                stream_md5 = _new_md5()
+                body = _iter_hashed_chunks(data, stream_md5)
+            else:
+                body = _iter_chunks(data)
+        elif hasattr(data, 'read'):
+            start = data.tell()
+            content_length = data.seek(0, os.SEEK_END) - start
+            data.seek(start)
+            
+            # Content-MD5 must be sent before the body, so hash the file
+            # chunk by chunk and rewind rather than buffering it
+            if verify_md5:
+                md5 = _new_md5()
+                for chunk in _iter_chunks(data):
+                    md5.update(chunk)
+                content_md5 = _b64encode(md5.digest()).decode('utf-8')
+                data.seek(start)
+            
+            body = _StreamingBody(data, content_length, hash_md5=trailing_md5)
+        else:
+            # Calculate MD5 if requested
+            if verify_md5:
+                md5 = _new_md5(data).digest()
+                content_md5 = _b64encode(md5).decode('utf-8')
+            
+            body = data
         
         headers = self._get_headers('PUT', path, content_type, content_md5)
         
-        response = requests.put(url, data=data, headers=headers)
+        response = self._session.put(url, data=body, headers=headers, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         
+        # Replicated backends return the hex MD5 of the body as the ETag of a
+        # single PUT; anything else cannot be compared
+        if trailing_md5:
+            if sent_md5 is None:
+                sent_md5 = (stream_md5 if stream_md5 is not None else body.md5).hexdigest()
+            etag = response.headers.get('ETag', '').strip('"').lower()
+            if not _MD5_ETAG_RE.fullmatch(etag):
+                warnings.warn(
+                    f"cannot verify upload of {path}: ETag {etag!r} is not an MD5 digest",
+                    RuntimeWarning
+                )
+            elif etag != sent_md5:
+                raise ValueError(f"ETag {etag!r} does not match uploaded MD5 {sent_md5!r}")
+        
         return response
     
     def get_object(self, bucket, key, byte_range=None):
@@ -103,7 +387,7 @@ class S3Client:
             Object data as bytes
         """
         path = f"/{bucket}/{key}"
-        url = urljoin(self.base_url, path)
+        url = self.base_url + path
         
         headers = self._get_headers('GET', path)
         
@@ -111,7 +395,7 @@ class S3Client:
             start, end = byte_range
             headers['Range'] = f'bytes={start}-{end}'
         
-        response = requests.get(url, headers=headers)
+        response = self._session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         
         return response.content
@@ -128,19 +412,16 @@ class S3Client:
             Dict with metadata (size, etag, content-type, etc.)
         """
         path = f"/{bucket}/{key}"
-        url = urljoin(self.base_url, path)
+        url = self.base_url + path
         
         headers = self._get_headers('HEAD', path)
         
-        response = requests.head(url, headers=headers)
-        response.raise_for_status()
-        
-        return {
-            'size': int(response.headers.get('Content-Length', 0)),
-            'etag': response.headers.get('ETag', '').strip('"'),
-            'content_type': response.headers.get('Content-Type', ''),
-            'last_modified': response.headers.get('Last-Modified', '')
-        }
+        # HEAD and DELETE carry no body (or a short error document), so the
+        # connection goes straight back to the pool; the with block releases
+        # it even when raise_for_status() raises
+        with self._session.head(url, headers=headers, timeout=DEFAULT_TIMEOUT) as response:
+            response.raise_for_status()
+            return _object_metadata(response.headers)
     
     def delete_object(self, bucket, key):
         """
@@ -154,12 +435,12 @@ class S3Client:
             Response object
         """
         path = f"/{bucket}/{key}"
-        url = urljoin(self.base_url, path)
+        url = self.base_url + path
         
         headers = self._get_headers('DELETE', path)
         
-        response = requests.delete(url, headers=headers)
-        response.raise_for_status()
+        with self._session.delete(url, headers=headers, timeout=DEFAULT_TIMEOUT) as response:
+            response.raise_for_status()
         
         return response
     
@@ -176,158 +457,413 @@ class S3Client:
             List of object keys
         """
         path = f"/{bucket}"
-        params = {
-            'list-type': '2',
-            'prefix': prefix,
-            'max-keys': max_keys
-        }
-        url = urljoin(self.base_url, path) + '?' + urlencode(params)
+        url = f"{self.base_url}{path}?list-type=2&prefix={quote(prefix, safe='')}&max-keys={max_keys}"
+        
+        headers = self._get_headers('GET', path)
+        
+        # Parse the XML incrementally off the socket instead of decoding
+        # the whole listing into a str first
+        keys = []
+        with self._session.get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            _collect_keys(ET.iterparse(response.raw, events=('end',)), keys)
+        
+        return keys
+
+
+class AsyncS3Client(_S3Signer):
+    """Asyncio S3 client over httpx, sharing S3Client's signing.
+    
+    Requires ``pip install httpx[http2]``. Many requests can be issued
+    concurrently with asyncio.gather() over a shared connection pool.
+    HTTPS endpoints that negotiate HTTP/2 multiplex them over one
+    connection; cleartext (http://) endpoints use HTTP/1.1 keep-alive.
+    
+    put_object only accepts bytes or str bodies: file-like objects and
+    trailing_md5 are supported by S3Client only.
+    """
+    
+    __slots__ = ('_client',)
+    
+    def __init__(self, base_url, access_key, secret_key):
+        """
+        Initialize async S3 client
+        
+        Args:
+            base_url: Base URL of the S3 gateway (e.g., http://localhost:9000)
+            access_key: Your access key
+            secret_key: Your secret key
+        """
+        if httpx is None:
+            raise ImportError("AsyncS3Client requires httpx: pip install httpx[http2]")
+        
+        super().__init__(base_url, access_key, secret_key)
+        
+        connect_timeout, read_timeout = DEFAULT_TIMEOUT
+        limits = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+        # The explicit transport is needed for connect retries; httpx only
+        # applies http2/limits from AsyncClient to its default transport, so
+        # they are set here too. http2=True on AsyncClient still checks that
+        # the h2 package is installed.
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=3)
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            transport=transport,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+    
+    async def close(self):
+        """Close the underlying HTTP client and its pooled connections"""
+        await self._client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def put_object(self, bucket, key, data, content_type='application/octet-stream', verify_md5=False):
+        """
+        Upload an object
+        
+        Args:
+            bucket: Bucket name
+            key: Object key
+            data: Object data (bytes or string; unlike S3Client, file-like
+                objects are not accepted)
+            content_type: Content type
+            verify_md5: If True, calculate and send Content-MD5 header
+        
+        Returns:
+            Response object
+        
+        Raises:
+            TypeError: If data is not bytes or str
+        """
+        path = f"/{bucket}/{key}"
+        url = self.base_url + path
+        
+        # Convert string to bytes if needed
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        elif not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("AsyncS3Client.put_object accepts bytes or str; "
+                            "use S3Client to stream file-like objects")
+        
+        # Calculate MD5 if requested
+        content_md5 = None
+        if verify_md5:
+            md5 = _new_md5(data).digest()
+            content_md5 = _b64encode(md5).decode('utf-8')
+        
+        headers = self._get_headers('PUT', path, content_type, content_md5)
+        
+        response = await self._client.put(url, content=data, headers=headers)
+        response.raise_for_status()
+        
+        return response
+    
+    async def get_object(self, bucket, key, byte_range=None):
+        """
+        Download an object
+        
+        Args:
+            bucket: Bucket name
+            key: Object key
+            byte_range: Optional tuple (start, end) for range request
+        
+        Returns:
+            Object data as bytes
+        """
+        path = f"/{bucket}/{key}"
+        url = self.base_url + path
         
         headers = self._get_headers('GET', path)
         
-        response = requests.get(url, headers=headers)
+        if byte_range:
+            start, end = byte_range
+            headers['Range'] = f'bytes={start}-{end}'
+        
+        response = await self._client.get(url, headers=headers)
         response.raise_for_status()
         
-        # Parse XML response (simplified - you might want to use xml.etree)
-        # For now, just return raw response
-        return response.text
+        return response.content
     
-    def generate_presigned_url(self, bucket, key, method='GET', expires_in=3600):
+    async def head_object(self, bucket, key):
         """
-        Generate a presigned URL (note: this should ideally be done server-side)
+        Get object metadata
         
         Args:
             bucket: Bucket name
             key: Object key
-            method: HTTP method (GET, PUT, DELETE)
-            expires_in: Expiration time in seconds
         
         Returns:
-            Presigned URL string
+            Dict with metadata (size, etag, content-type, etc.)
         """
         path = f"/{bucket}/{key}"
-        expires = int(datetime.now(timezone.utc).timestamp()) + expires_in
-        
-        string_to_sign = f"{method}\n{bucket}/{key}\n{expires}"
-        signature = hmac.new(
-            self.secret_key.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        params = {
-            'AWSAccessKeyId': self.access_key,
-            'Expires': expires,
-            'Signature': signature
-        }
+        url = self.base_url + path
+        
+        headers = self._get_headers('HEAD', path)
+        
+        response = await self._client.head(url, headers=headers)
+        response.raise_for_status()
+        
+        return _object_metadata(response.headers)
+    
+    async def delete_object(self, bucket, key):
+        """
+        Delete an object
+        
+        Args:
+            bucket: Bucket name
+            key: Object key
+        
+        Returns:
+            Response object
+        """
+        path = f"/{bucket}/{key}"
+        url = self.base_url + path
+        
+        headers = self._get_headers('DELETE', path)
+        
+        response = await self._client.delete(url, headers=headers)
+        response.raise_for_status()
+        
+        return response
+    
+    async def list_objects(self, bucket, prefix='', max_keys=1000):
+        """
+        List objects in a bucket
         
-        url = urljoin(self.base_url, path) + '?' + urlencode(params)
-        return url
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix filter
+            max_keys: Maximum number of objects to return
+        
+        Returns:
+            List of object keys
+        """
+        path = f"/{bucket}"
+        url = f"{self.base_url}{path}?list-type=2&prefix={quote(prefix, safe='')}&max-keys={max_keys}"
+        
+        headers = self._get_headers('GET', path)
+        
+        # Feed the XML to a pull parser chunk by chunk as it arrives
+        keys = []
+        parser = ET.XMLPullParser(events=('end',))
+        async with self._client.stream('GET', url, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                _collect_keys(parser.read_events(), keys)
+        parser.close()
+        _collect_keys(parser.read_events(), keys)
+        
+        return keys
 
 
 def example_usage():
     """Example usage of the S3 client"""
     
     # Initialize client with your credentials
-    client = S3Client(
+    with S3Client(
         base_url='http://localhost:9000',
         access_key='AKEXAMPLE00000000001',
         secret_key='secretkey1234567890abcdefghijklmnopqrstuv'
-    )
-    
-    print("S3 Storage Client Example")
-    print("=" * 50)
-    
-    # Example 1: Upload an object
-    print("\n1. Uploading object...")
-    try:
-        response = client.put_object(
-            bucket='mybucket',
-            key='test/hello.txt',
-            data='Hello, World!',
-            content_type='text/plain'
-        )
-        print(f"   ✓ Upload successful! ETag: {response.headers.get('ETag')}")
-    except Exception as e:
-        print(f"   ✗ Upload failed: {e}")
-    
-    # Example 2: Download an object
-    print("\n2. Downloading object...")
-    try:
-        data = client.get_object(bucket='mybucket', key='test/hello.txt')
-        print(f"   ✓ Downloaded: {data.decode('utf-8')}")
-    except Exception as e:
-        print(f"   ✗ Download failed: {e}")
+    ) as client:
+        print("S3 Storage Client Example")
+        print("=" * 50)
+        
+        # Independent requests run concurrently over the client's pooled
+        # session; results are still reported in example order below
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # Examples 1 and 5 upload different objects
+            upload = executor.submit(
+                client.put_object,
+                bucket='mybucket',
+                key='test/hello.txt',
+                data='Hello, World!',
+                content_type='text/plain'
+            )
+            verified_upload = executor.submit(
+                client.put_object,
+                bucket='mybucket',
+                key='test/verified.txt',
+                data='This upload is verified!',
+                verify_md5=True
+            )
+            wait([upload, verified_upload])
+            
+            # Examples 2, 3, 4, 6 and 7 only read what the uploads wrote
+            download = executor.submit(client.get_object, bucket='mybucket', key='test/hello.txt')
+            head = executor.submit(client.head_object, bucket='mybucket', key='test/hello.txt')
+            range_download = executor.submit(
+                client.get_object,
+                bucket='mybucket',
+                key='test/hello.txt',
+                byte_range=(0, 4)
+            )
+            presigned_url = None
+            presigned_get = None
+            presigned_error = None
+            try:
+                presigned_url = client.generate_presigned_url(
+                    bucket='mybucket',
+                    key='test/hello.txt',
+                    method='GET',
+                    expires_in=3600  # 1 hour
+                )
+                # Fetched without the client, as a recipient of the URL would
+                presigned_get = executor.submit(requests.get, presigned_url, timeout=DEFAULT_TIMEOUT)
+            except Exception as e:
+                presigned_error = e
+            listing = executor.submit(client.list_objects, bucket='mybucket', prefix='test/')
+            
+            # Example 1: Upload an object
+            print("\n1. Uploading object...")
+            try:
+                response = upload.result()
+                print(f"   ✓ Upload successful! ETag: {response.headers.get('ETag')}")
+            except Exception as e:
+                print(f"   ✗ Upload failed: {e}")
+            
+            # Example 2: Download an object
+            print("\n2. Downloading object...")
+            try:
+                data = download.result()
+                print(f"   ✓ Downloaded: {data.decode('utf-8')}")
+            except Exception as e:
+                print(f"   ✗ Download failed: {e}")
+            
+            # Example 3: Get object metadata
+            print("\n3. Getting object metadata...")
+            try:
+                metadata = head.result()
+                print(f"   ✓ Size: {metadata['size']} bytes")
+                print(f"   ✓ ETag: {metadata['etag']}")
+                print(f"   ✓ Content-Type: {metadata['content_type']}")
+            except Exception as e:
+                print(f"   ✗ Head request failed: {e}")
+            
+            # Example 4: Range request
+            print("\n4. Range request (first 5 bytes)...")
+            try:
+                data = range_download.result()
+                print(f"   ✓ Downloaded: {data.decode('utf-8')}")
+            except Exception as e:
+                print(f"   ✗ Range request failed: {e}")
+            
+            # Example 5: Upload with MD5 verification
+            print("\n5. Upload with MD5 verification...")
+            try:
+                verified_upload.result()
+                print(f"   ✓ Verified upload successful!")
+            except Exception as e:
+                print(f"   ✗ Verified upload failed: {e}")
+            
+            # Example 6: Generate presigned URL
+            print("\n6. Generating presigned URL...")
+            try:
+                if presigned_error is not None:
+                    raise presigned_error
+                print(f"   ✓ Presigned URL (valid for 1 hour):")
+                print(f"     {presigned_url}")
+                
+                # Test the presigned URL
+                response = presigned_get.result()
+                if response.ok:
+                    print(f"   ✓ Presigned URL works! Data: {response.text}")
+            except Exception as e:
+                print(f"   ✗ Presigned URL generation failed: {e}")
+            
+            # Example 7: List objects
+            print("\n7. Listing objects with prefix...")
+            try:
+                keys = listing.result()
+                print(f"   ✓ Listed {len(keys)} objects:")
+                for key in keys:
+                    print(f"     {key}")
+            except Exception as e:
+                print(f"   ✗ List objects failed: {e}")
+        
+        # Example 8: Delete object (depends on example 5, so runs last)
+        print("\n8. Deleting object...")
+        try:
+            client.delete_object(bucket='mybucket', key='test/verified.txt')
+            print(f"   ✓ Object deleted successfully")
+        except Exception as e:
+            print(f"   ✗ Delete failed: {e}")
     
-    # Example 3: Get object metadata
-    print("\n3. Getting object metadata...")
-    try:
-        metadata = client.head_object(bucket='mybucket', key='test/hello.txt')
-        print(f"   ✓ Size: {metadata['size']} bytes")
-        print(f"   ✓ ETag: {metadata['etag']}")
-        print(f"   ✓ Content-Type: {metadata['content_type']}")
-    except Exception as e:
-        print(f"   ✗ Head request failed: {e}")
+    print("\n" + "=" * 50)
+    print("Examples complete!")
+
+
+async def async_example_usage():
+    """Example usage of the async S3 client"""
     
-    # Example 4: Range request
-    print("\n4. Range request (first 5 bytes)...")
-    try:
-        data = client.get_object(
-            bucket='mybucket',
-            key='test/hello.txt',
-            byte_range=(0, 4)
-        )
-        print(f"   ✓ Downloaded: {data.decode('utf-8')}")
-    except Exception as e:
-        print(f"   ✗ Range request failed: {e}")
+    print("Async S3 Storage Client Example")
+    print("=" * 50)
     
-    # Example 5: Upload with MD5 verification
-    print("\n5. Upload with MD5 verification...")
-    try:
-        response = client.put_object(
-            bucket='mybucket',
-            key='test/verified.txt',
-            data='This upload is verified!',
-            verify_md5=True
+    async with AsyncS3Client(
+        base_url='http://localhost:9000',
+        access_key='AKEXAMPLE00000000001',
+        secret_key='secretkey1234567890abcdefghijklmnopqrstuv'
+    ) as client:
+        # Uploads first, then the reads that depend on them, each batch
+        # in parallel
+        upload, verified_upload = await asyncio.gather(
+            client.put_object('mybucket', 'test/hello.txt', 'Hello, World!', content_type='text/plain'),
+            client.put_object('mybucket', 'test/verified.txt', 'This upload is verified!', verify_md5=True),
+            return_exceptions=True
         )
-        print(f"   ✓ Verified upload successful!")
-    except Exception as e:
-        print(f"   ✗ Verified upload failed: {e}")
-    
-    # Example 6: Generate presigned URL
-    print("\n6. Generating presigned URL...")
-    try:
-        presigned_url = client.generate_presigned_url(
-            bucket='mybucket',
-            key='test/hello.txt',
-            method='GET',
-            expires_in=3600  # 1 hour
+        download, metadata, range_download = await asyncio.gather(
+            client.get_object('mybucket', 'test/hello.txt'),
+            client.head_object('mybucket', 'test/hello.txt'),
+            client.get_object('mybucket', 'test/hello.txt', byte_range=(0, 4)),
+            return_exceptions=True
         )
-        print(f"   ✓ Presigned URL (valid for 1 hour):")
-        print(f"     {presigned_url}")
         
-        # Test the presigned URL
-        response = requests.get(presigned_url)
-        if response.ok:
-            print(f"   ✓ Presigned URL works! Data: {response.text}")
-    except Exception as e:
-        print(f"   ✗ Presigned URL generation failed: {e}")
-    
-    # Example 7: List objects
-    print("\n7. Listing objects with prefix...")
-    try:
-        result = client.list_objects(bucket='mybucket', prefix='test/')
-        print(f"   ✓ Listed objects (XML response)")
-    except Exception as e:
-        print(f"   ✗ List objects failed: {e}")
-    
-    # Example 8: Delete object
-    print("\n8. Deleting object...")
-    try:
-        client.delete_object(bucket='mybucket', key='test/verified.txt')
-        print(f"   ✓ Object deleted successfully")
-    except Exception as e:
-        print(f"   ✗ Delete failed: {e}")
+        print("\n1. Uploading object...")
+        if isinstance(upload, Exception):
+            print(f"   ✗ Upload failed: {upload}")
+        else:
+            print(f"   ✓ Upload successful! ETag: {upload.headers.get('ETag')}")
+        
+        print("\n2. Downloading object...")
+        if isinstance(download, Exception):
+            print(f"   ✗ Download failed: {download}")
+        else:
+            print(f"   ✓ Downloaded: {download.decode('utf-8')}")
+        
+        print("\n3. Getting object metadata...")
+        if isinstance(metadata, Exception):
+            print(f"   ✗ Head request failed: {metadata}")
+        else:
+            print(f"   ✓ Size: {metadata['size']} bytes")
+            print(f"   ✓ ETag: {metadata['etag']}")
+            print(f"   ✓ Content-Type: {metadata['content_type']}")
+        
+        print("\n4. Range request (first 5 bytes)...")
+        if isinstance(range_download, Exception):
+            print(f"   ✗ Range request failed: {range_download}")
+        else:
+            print(f"   ✓ Downloaded: {range_download.decode('utf-8')}")
+        
+        print("\n5. Upload with MD5 verification...")
+        if isinstance(verified_upload, Exception):
+            print(f"   ✗ Verified upload failed: {verified_upload}")
+        else:
+            print("   ✓ Verified upload successful!")
+        
+        # Delete depends on example 5, so it runs last
+        print("\n6. Deleting object...")
+        try:
+            await client.delete_object('mybucket', 'test/verified.txt')
+            print("   ✓ Object deleted successfully")
+        except Exception as e:
+            print(f"   ✗ Delete failed: {e}")
     
     print("\n" + "=" * 50)
     print("Examples complete!")
@@ -339,10 +875,14 @@ def check_metrics():
     print("=" * 50)
     
     try:
-        response = requests.get('http://localhost:9091/metrics')
-        if response.ok:
-            # Parse some key metrics
-            lines = response.text.split('\n')
+        with requests.get('http://localhost:9091/metrics', stream=True, timeout=DEFAULT_TIMEOUT) as response:
+            if not response.ok:
+                print("  ✗ Could not fetch metrics")
+                return
+            
+            # Parse some key metrics line by line as the scrape streams in
+            response.encoding = response.encoding or 'utf-8'
+            lines = response.iter_lines(decode_unicode=True)
             
             metrics_of_interest = [
                 's3_requests_total',
@@ -352,20 +892,32 @@ def check_metrics():
                 's3_bytes_stored_total'
             ]
             
+            # One pass over the scrape: str.startswith(tuple) checks every
+            # remaining metric name at once, keeping the first line for each
+            found = {}
+            prefixes = tuple(metrics_of_interest)
+            for line in lines:
+                if not line.startswith(prefixes):
+                    continue
+                metric_name = next(m for m in prefixes if line.startswith(m))
+                found[metric_name] = line
+                prefixes = tuple(m for m in prefixes if m != metric_name)
+                if not prefixes:
+                    break
+            
             for metric_name in metrics_of_interest:
-                for line in lines:
-                    if line.startswith(metric_name) and not line.startswith('#'):
-                        print(f"  {line}")
-                        break
-        else:
-            print("  ✗ Could not fetch metrics")
+                if metric_name in found:
+                    print(f"  {found[metric_name]}")
     except Exception as e:
         print(f"  ✗ Error fetching metrics: {e}")
 
 
 if __name__ == '__main__':
-    # Run examples
-    example_usage()
+    # Run examples (pass --async to use AsyncS3Client instead; needs httpx)
+    if '--async' in sys.argv[1:]:
+        asyncio.run(async_example_usage())
+    else:
+        example_usage()
     
     # Show metrics
     check_metrics()
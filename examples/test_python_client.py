@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the Python S3 client example
+Run with: python3 -m unittest test_python_client
+"""
+
+import hashlib
+import io
+import os
+import unittest
+import warnings
+
+try:
+    import python_client
+except ImportError:  # requests not installed
+    python_client = None
+
+
+class _FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, headers):
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """Records PUT requests and answers with the MD5 ETag of the body"""
+
+    def __init__(self, etag=None):
+        self.requests = []
+        self.etag = etag
+
+    def put(self, url, data, headers, timeout):
+        # Like requests, a zero-length iterable body is never iterated
+        if isinstance(data, bytes):
+            body = data
+        elif hasattr(data, '__len__') and not len(data):
+            body = b''
+        else:
+            body = b''.join(data)
+        self.requests.append((url, body, headers))
+        etag = self.etag if self.etag is not None else hashlib.md5(body).hexdigest()
+        return _FakeResponse({'ETag': '"%s"' % etag})
+
+    def close(self):
+        pass
+
+
+@unittest.skipIf(python_client is None, "requests is not installed")
+class PutObjectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = python_client.S3Client('http://localhost:9000', 'AK', 'secret')
+        self.client._session = _FakeSession()
+
+    def test_trailing_md5_empty_file(self):
+        # An empty body is never iterated by requests
+        self.client.put_object('mybucket', 'empty', io.BytesIO(b''), trailing_md5=True)
+        _, body, _ = self.client._session.requests[0]
+        self.assertEqual(body, b'')
+
+    def test_trailing_md5_mismatch(self):
+        self.client._session.etag = '0' * 32
+        with self.assertRaises(ValueError):
+            self.client.put_object('mybucket', 'k', b'data', trailing_md5=True)
+
+    def test_trailing_md5_unverifiable_etag(self):
+        # Erasure-coded backends return '""' without a Content-MD5 header
+        self.client._session.etag = ''
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.client.put_object('mybucket', 'k', b'data', trailing_md5=True)
+        self.assertEqual([w.category for w in caught], [RuntimeWarning])
+
+    def _pipe_reader(self, payload):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, payload)
+        os.close(write_fd)
+        reader = os.fdopen(read_fd, 'rb')
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_non_seekable_stream(self):
+        self.client.put_object('mybucket', 'piped', self._pipe_reader(b'pipedata'))
+        _, body, headers = self.client._session.requests[0]
+        self.assertEqual(body, b'pipedata')
+        self.assertNotIn('Content-Length', headers)
+
+    def test_non_seekable_stream_rejects_verify_md5(self):
+        with self.assertRaises(ValueError):
+            self.client.put_object('mybucket', 'piped', self._pipe_reader(b'pipedata'), verify_md5=True)
+        self.assertEqual(self.client._session.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()